@@ -23,6 +23,62 @@ def run_command_or_exit_on_failure(command):
         print(f"Error running command: {e}")
         exit(1)
 
+if sys.platform.startswith("win"):
+    # Resolve the user32 functions used for WM_PASTE once, with their signatures set,
+    # so each paste is just a few foreign calls.
+    class GUITHREADINFO(ctypes.Structure):
+        _fields_ = [
+            ("cbSize", wintypes.DWORD),
+            ("flags", wintypes.DWORD),
+            ("hwndActive", wintypes.HWND),
+            ("hwndFocus", wintypes.HWND),
+            ("hwndCapture", wintypes.HWND),
+            ("hwndMenuOwner", wintypes.HWND),
+            ("hwndMoveSize", wintypes.HWND),
+            ("hwndCaret", wintypes.HWND),
+            ("rcCaret", wintypes.RECT),
+        ]
+
+    WM_PASTE = 0x0302
+    SMTO_ABORTIFHUNG = 0x0002
+    DWORD_PTR = ctypes.c_size_t
+    WM_PASTE_CLASSES = frozenset({
+        "edit",
+        "richedit20a",
+        "richedit20w",
+        "richedit50a",
+        "richedit50w",
+    })
+
+    _user32 = ctypes.windll.user32
+
+    _GetForegroundWindow = _user32.GetForegroundWindow
+    _GetForegroundWindow.restype = wintypes.HWND
+
+    _GetWindowThreadProcessId = _user32.GetWindowThreadProcessId
+    _GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+    _GetWindowThreadProcessId.restype = wintypes.DWORD
+
+    _GetGUIThreadInfo = _user32.GetGUIThreadInfo
+    _GetGUIThreadInfo.argtypes = [wintypes.DWORD, ctypes.POINTER(GUITHREADINFO)]
+    _GetGUIThreadInfo.restype = wintypes.BOOL
+
+    _GetClassNameW = _user32.GetClassNameW
+    _GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    _GetClassNameW.restype = ctypes.c_int
+
+    _SendMessageTimeoutW = _user32.SendMessageTimeoutW
+    _SendMessageTimeoutW.argtypes = [
+        wintypes.HWND,
+        wintypes.UINT,
+        wintypes.WPARAM,
+        wintypes.LPARAM,
+        wintypes.UINT,
+        wintypes.UINT,
+        ctypes.POINTER(DWORD_PTR),
+    ]
+    _SendMessageTimeoutW.restype = DWORD_PTR
+
 class InputSimulator:
     """
     A class to simulate keyboard input using various methods.
@@ -32,8 +88,10 @@ class InputSimulator:
         """
         Initialize the InputSimulator with the specified configuration.
         """
-        self.input_method = ConfigManager.get_config_value('post_processing', 'input_method')
+        post_processing = ConfigManager.get_config_section('post_processing')
+        self.input_method = post_processing.get('input_method')
         self.dotool_process = None
+        self._dotool_fd = None
 
         if self.input_method in ('pynput', 'clipboard'):
             self.keyboard = PynputController()
@@ -44,8 +102,10 @@ class InputSimulator:
         """
         Initialize the dotool process for input simulation.
         """
-        self.dotool_process = subprocess.Popen("dotool", stdin=subprocess.PIPE, text=True)
+        # Binary, unbuffered stdin: each command is pre-encoded and written in one go.
+        self.dotool_process = subprocess.Popen(["dotool"], stdin=subprocess.PIPE, bufsize=0)
         assert self.dotool_process.stdin is not None
+        self._dotool_fd = self.dotool_process.stdin.fileno()
 
     def _terminate_dotool(self):
         """
@@ -54,6 +114,7 @@ class InputSimulator:
         if self.dotool_process:
             os.kill(self.dotool_process.pid, signal.SIGINT)
             self.dotool_process = None
+            self._dotool_fd = None
 
     def typewrite(self, text):
         """
@@ -62,17 +123,23 @@ class InputSimulator:
         Args:
             text (str): The text to type.
         """
+        # Silent recordings come back empty (or just the trailing space from
+        # post-processing); don't touch the clipboard or send keystrokes for them.
+        if not text or not text.strip():
+            return
+
         ConfigManager.console_print(f"Inserting via {self.input_method} ({len(text)} chars)")
 
-        interval = ConfigManager.get_config_value('post_processing', 'writing_key_press_delay')
+        post_processing = ConfigManager.get_config_section('post_processing')
+        interval = post_processing.get('writing_key_press_delay')
         if self.input_method == 'pynput':
             self._typewrite_pynput(text, interval)
         elif self.input_method == 'clipboard':
-            paste_delay = ConfigManager.get_config_value('post_processing', 'clipboard_paste_delay')
+            paste_delay = post_processing.get('clipboard_paste_delay')
             if paste_delay is None:
                 paste_delay = 0.03
 
-            restore_clipboard = ConfigManager.get_config_value('post_processing', 'restore_clipboard')
+            restore_clipboard = post_processing.get('restore_clipboard')
             if restore_clipboard is None:
                 restore_clipboard = True
 
@@ -95,10 +162,33 @@ class InputSimulator:
             text (str): The text to type.
             interval (float): The interval between keystrokes in seconds.
         """
+        if not interval or interval <= 0:
+            # No per-key delay requested: let pynput emit the whole string in one call.
+            self.keyboard.type(text)
+            return
+
         for char in text:
-            self.keyboard.press(char)
-            self.keyboard.release(char)
+            self.keyboard.tap(char)
+            self._wait(interval)
+
+    @staticmethod
+    def _wait(interval):
+        """
+        Wait for the given interval after a key press.
+
+        time.sleep() is too coarse for sub-millisecond waits (notably on Windows), so those
+        busy-wait on time.perf_counter(); longer intervals just sleep.
+
+        Args:
+            interval (float): The interval to wait in seconds.
+        """
+        if interval >= 0.001:
             time.sleep(interval)
+            return
+
+        deadline = time.perf_counter() + interval
+        while time.perf_counter() < deadline:
+            pass
 
     def _typewrite_ydotool(self, text, interval):
         """
@@ -108,6 +198,9 @@ class InputSimulator:
             text (str): The text to type.
             interval (float): The interval between keystrokes in seconds.
         """
+        # Unlike dotool, the ydotool client can't be kept alive and fed commands over
+        # stdin: each invocation sends one command to ydotoold and exits. This spawns one
+        # process per transcription (not per keystroke), since the whole text goes at once.
         cmd = "ydotool"
         run_command_or_exit_on_failure([
             cmd,
@@ -127,9 +220,11 @@ class InputSimulator:
             interval (float): The interval between keystrokes in seconds.
         """
         assert self.dotool_process and self.dotool_process.stdin
-        self.dotool_process.stdin.write(f"typedelay {interval * 1000}\n")
-        self.dotool_process.stdin.write(f"type {text}\n")
-        self.dotool_process.stdin.flush()
+        command = memoryview(f"typedelay {interval * 1000}\ntype {text}\n".encode('utf-8'))
+        # Write straight to the pipe's file descriptor, looping in case of a partial write.
+        while command:
+            written = os.write(self._dotool_fd, command)
+            command = command[written:]
 
     def _paste_text(self, text, *, typing_interval, paste_delay, restore_clipboard):
         """
@@ -190,45 +285,18 @@ class InputSimulator:
             return False
 
         try:
-            user32 = ctypes.windll.user32
-
-            class GUITHREADINFO(ctypes.Structure):
-                _fields_ = [
-                    ("cbSize", wintypes.DWORD),
-                    ("flags", wintypes.DWORD),
-                    ("hwndActive", wintypes.HWND),
-                    ("hwndFocus", wintypes.HWND),
-                    ("hwndCapture", wintypes.HWND),
-                    ("hwndMenuOwner", wintypes.HWND),
-                    ("hwndMoveSize", wintypes.HWND),
-                    ("hwndCaret", wintypes.HWND),
-                    ("rcCaret", wintypes.RECT),
-                ]
-
-            GetForegroundWindow = user32.GetForegroundWindow
-            GetWindowThreadProcessId = user32.GetWindowThreadProcessId
-            GetGUIThreadInfo = user32.GetGUIThreadInfo
-            GetClassNameW = user32.GetClassNameW
-            SendMessageTimeoutW = user32.SendMessageTimeoutW
-
-            GetForegroundWindow.restype = wintypes.HWND
-            hwnd_foreground = GetForegroundWindow()
+            hwnd_foreground = _GetForegroundWindow()
             if not hwnd_foreground:
                 return False
 
             process_id = wintypes.DWORD()
-            GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
-            GetWindowThreadProcessId.restype = wintypes.DWORD
-
-            thread_id = GetWindowThreadProcessId(hwnd_foreground, ctypes.byref(process_id))
+            thread_id = _GetWindowThreadProcessId(hwnd_foreground, ctypes.byref(process_id))
             if not thread_id:
                 return False
 
             info = GUITHREADINFO()
             info.cbSize = ctypes.sizeof(GUITHREADINFO)
-            GetGUIThreadInfo.argtypes = [wintypes.DWORD, ctypes.POINTER(GUITHREADINFO)]
-            GetGUIThreadInfo.restype = wintypes.BOOL
-            if not GetGUIThreadInfo(thread_id, ctypes.byref(info)):
+            if not _GetGUIThreadInfo(thread_id, ctypes.byref(info)):
                 return False
 
             hwnd_target = info.hwndFocus or info.hwndActive
@@ -239,36 +307,14 @@ class InputSimulator:
             # handle it (Electron/Chromium, WinUI/XAML, etc). Only use WM_PASTE for
             # well-known controls; otherwise fall back to Ctrl+V.
             class_name_buf = ctypes.create_unicode_buffer(256)
-            GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
-            GetClassNameW.restype = ctypes.c_int
-            if GetClassNameW(hwnd_target, class_name_buf, len(class_name_buf)) == 0:
+            if _GetClassNameW(hwnd_target, class_name_buf, len(class_name_buf)) == 0:
                 return False
 
-            wm_paste_classes = {
-                "edit",
-                "richedit20a",
-                "richedit20w",
-                "richedit50a",
-                "richedit50w",
-            }
-            if class_name_buf.value.casefold() not in wm_paste_classes:
+            if class_name_buf.value.casefold() not in WM_PASTE_CLASSES:
                 return False
 
-            WM_PASTE = 0x0302
-            SMTO_ABORTIFHUNG = 0x0002
-            DWORD_PTR = ctypes.c_size_t
             result = DWORD_PTR()
-            SendMessageTimeoutW.argtypes = [
-                wintypes.HWND,
-                wintypes.UINT,
-                wintypes.WPARAM,
-                wintypes.LPARAM,
-                wintypes.UINT,
-                wintypes.UINT,
-                ctypes.POINTER(DWORD_PTR),
-            ]
-            SendMessageTimeoutW.restype = DWORD_PTR
-            ok = SendMessageTimeoutW(hwnd_target, WM_PASTE, 0, 0, SMTO_ABORTIFHUNG, 100, ctypes.byref(result))
+            ok = _SendMessageTimeoutW(hwnd_target, WM_PASTE, 0, 0, SMTO_ABORTIFHUNG, 100, ctypes.byref(result))
             return bool(ok)
         except Exception:
             return False
@@ -17,6 +17,9 @@ from input_simulation import InputSimulator
 from utils import ConfigManager
 
 
+BEEP_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'beep.wav')
+
+
 class WhisperWriterApp(QObject):
     def __init__(self):
         """
@@ -45,6 +48,9 @@ class WhisperWriterApp(QObject):
         """
         self.input_simulator = InputSimulator()
 
+        if ConfigManager.get_config_value('misc', 'noise_on_completion'):
+            self.sound_player.preload([BEEP_PATH])
+
         self.key_listener = KeyListener()
         self.key_listener.add_callback("on_activate", self.on_activation)
         self.key_listener.add_callback("on_deactivate", self.on_deactivation)
@@ -179,8 +185,7 @@ class WhisperWriterApp(QObject):
         self.input_simulator.typewrite(result)
 
         if ConfigManager.get_config_value('misc', 'noise_on_completion'):
-            beep_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'beep.wav')
-            self.sound_player.play(beep_path)
+            self.sound_player.play(BEEP_PATH)
 
 
         if ConfigManager.get_config_value('recording_options', 'recording_mode') == 'continuous':
@@ -89,8 +89,14 @@ class ResultThread(QThread):
                     phase_started[status] = time.perf_counter()
                 self.statusSignal.emit(status)
 
+            def on_segment(text: str):
+                # Show local transcription progress as segments are decoded.
+                ConfigManager.console_print(f'Segment: {text.strip()}')
+
             start_time = time.perf_counter()
-            result = transcribe(audio_data, self.local_model, status_callback=emit_status)
+            result = transcribe(audio_data, self.local_model,
+                                status_callback=emit_status,
+                                segment_callback=on_segment)
             end_time = time.perf_counter()
 
             transcription_time = end_time - start_time
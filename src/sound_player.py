@@ -1,4 +1,5 @@
 import os
+from typing import Iterable
 
 from PyQt5.QtCore import QUrl
 from PyQt5.QtMultimedia import QSoundEffect
@@ -7,12 +8,23 @@ class SoundPlayer:
     def __init__(self):
         self._effects = {}
 
-    def play(self, path: str, volume: float = 0.8):
-        path = os.path.abspath(path)
+    def _get_effect(self, path: str) -> QSoundEffect:
         eff = self._effects.get(path)
         if eff is None:
             eff = QSoundEffect()
             eff.setSource(QUrl.fromLocalFile(path))
             self._effects[path] = eff
+        return eff
+
+    def preload(self, paths: Iterable[str]):
+        # Load each sound ahead of time and play it once muted, so the audio backend is
+        # already warmed up by the time the first audible play() happens.
+        for path in paths:
+            eff = self._get_effect(os.path.abspath(path))
+            eff.setVolume(0.0)
+            eff.play()
+
+    def play(self, path: str, volume: float = 0.8):
+        eff = self._get_effect(os.path.abspath(path))
         eff.setVolume(volume)
         eff.play()
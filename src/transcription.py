@@ -1,9 +1,11 @@
+import functools
 import io
 import os
-from typing import Callable
+import struct
+import threading
+from typing import Callable, Iterable, Iterator
 
 import numpy as np
-import soundfile as sf
 from faster_whisper import WhisperModel
 from openai import OpenAI
 
@@ -12,9 +14,14 @@ from utils import ConfigManager
 
 DEFAULT_MP3_BITRATE_KBPS = 48
 DEFAULT_MP3_QUALITY = 2
+WAV_HEADER_SIZE_BYTES = 44
+MP3_ENCODE_CHUNK_SAMPLES = 32 * 1024  # 64 KiB of int16 PCM per encoder call
 
 
 StatusCallback = Callable[[str], None]
+SegmentCallback = Callable[[str], None]
+
+_CLIENT_CACHE: dict[tuple[str | None, str], OpenAI] = {}
 
 
 def _emit_status(status_callback: StatusCallback | None, status: str) -> None:
@@ -22,12 +29,27 @@ def _emit_status(status_callback: StatusCallback | None, status: str) -> None:
         status_callback(status)
 
 
-class _UploadNotifyingIO(io.BytesIO):
-    def __init__(self, initial_bytes: bytes, *, on_upload_complete: Callable[[], None]):
-        super().__init__(initial_bytes)
+class _UploadNotifyingIO(io.BufferedIOBase):
+    # Wraps the encoded payload stream rather than copying its bytes into a new buffer.
+    def __init__(self, payload: io.BytesIO, *, on_upload_complete: Callable[[], None]):
+        super().__init__()
+        self._payload = payload
         self._on_upload_complete = on_upload_complete
         self._did_notify = False
-        self._total_size = len(initial_bytes)
+        with payload.getbuffer() as view:
+            self._total_size = view.nbytes
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._payload.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._payload.tell()
 
     def _maybe_notify(self, *, at_eof: bool) -> None:
         if self._did_notify:
@@ -40,17 +62,116 @@ class _UploadNotifyingIO(io.BytesIO):
             self._did_notify = True
             self._on_upload_complete()
 
-    def read(self, size: int = -1) -> bytes:  # type: ignore[override]
-        chunk = super().read(size)
+    def read(self, size: int | None = -1) -> bytes:  # type: ignore[override]
+        chunk = self._payload.read(size)
         self._maybe_notify(at_eof=not chunk)
         return chunk
 
     def readinto(self, b) -> int:  # type: ignore[override]
-        n = super().readinto(b)
+        n = self._payload.readinto(b)
         self._maybe_notify(at_eof=n == 0)
         return n
 
 
+class _StreamingUploadIO(io.BufferedIOBase):
+    # Upload body fed by a background producer, so the HTTP client can start sending while
+    # the payload is still being encoded. Produced chunks are kept so the body can be
+    # rewound with seek(0) if the client retries the request.
+    def __init__(self, chunks: Iterable[bytes], *, on_upload_complete: Callable[[], None]):
+        super().__init__()
+        self._on_upload_complete = on_upload_complete
+        self._did_notify = False
+        self._cond = threading.Condition()
+        self._chunks: list[bytes] = []
+        self._total_size = 0
+        self._finished = False
+        self._error: BaseException | None = None
+        self._index = 0
+        self._offset = 0
+        self._producer = threading.Thread(target=self._produce, args=(chunks,), daemon=True)
+        self._producer.start()
+
+    @property
+    def total_size(self) -> int:
+        """Size in bytes of the whole payload, waiting for the producer to finish."""
+        self._producer.join()
+        return self._total_size
+
+    def _produce(self, chunks: Iterable[bytes]) -> None:
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                with self._cond:
+                    self._chunks.append(chunk)
+                    self._total_size += len(chunk)
+                    self._cond.notify_all()
+        except BaseException as e:
+            with self._cond:
+                self._error = e
+        finally:
+            with self._cond:
+                self._finished = True
+                self._cond.notify_all()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        # Only rewinding is supported, and the total length isn't known up front, so
+        # HTTP clients fall back to a chunked upload.
+        return False
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('streaming upload can only be rewound to the start')
+        with self._cond:
+            self._index = 0
+            self._offset = 0
+        return 0
+
+    def read(self, size: int | None = -1) -> bytes:  # type: ignore[override]
+        with self._cond:
+            # Block until there's something to return: all data for an unbounded read,
+            # otherwise at least one new chunk (or the end of the stream).
+            if size is None or size < 0:
+                while not self._finished:
+                    self._cond.wait()
+            else:
+                while self._index >= len(self._chunks) and not self._finished:
+                    self._cond.wait()
+
+            if self._error is not None:
+                raise self._error
+
+            parts = []
+            remaining = size if size is not None and size >= 0 else None
+            while self._index < len(self._chunks) and (remaining is None or remaining > 0):
+                chunk = self._chunks[self._index]
+                end = len(chunk) if remaining is None else min(len(chunk), self._offset + remaining)
+                parts.append(chunk[self._offset:end])
+                if remaining is not None:
+                    remaining -= end - self._offset
+                if end == len(chunk):
+                    self._index += 1
+                    self._offset = 0
+                else:
+                    self._offset = end
+
+            data = b''.join(parts)
+            at_end = self._finished and self._index >= len(self._chunks)
+
+        self._maybe_notify(at_eof=at_end)
+        return data
+
+    def _maybe_notify(self, *, at_eof: bool) -> None:
+        # As with _UploadNotifyingIO, consuming the last bytes counts as upload-complete.
+        if self._did_notify or not at_eof:
+            return
+        self._did_notify = True
+        self._on_upload_complete()
+
+
 def create_local_model():
     """
     Create a local model using the faster-whisper library.
@@ -60,7 +181,13 @@ def create_local_model():
     compute_type = local_model_options['compute_type']
     model_path = local_model_options.get('model_path')
 
-    if compute_type == 'int8':
+    model_compute_type = compute_type
+    if compute_type == 'int8' and local_model_options['device'] == 'cuda':
+        # int8 weights with float16 activations use the GPU's int8 tensor cores.
+        device = 'cuda'
+        model_compute_type = 'int8_float16'
+        ConfigManager.console_print('Using int8 quantization on CUDA (int8_float16).')
+    elif compute_type == 'int8':
         device = 'cpu'
         ConfigManager.console_print('Using int8 quantization, forcing CPU usage.')
     else:
@@ -71,12 +198,12 @@ def create_local_model():
             ConfigManager.console_print(f'Loading model from: {model_path}')
             model = WhisperModel(model_path,
                                  device=device,
-                                 compute_type=compute_type,
+                                 compute_type=model_compute_type,
                                  download_root=None)  # Prevent automatic download
         else:
             model = WhisperModel(local_model_options['model'],
                                  device=device,
-                                 compute_type=compute_type)
+                                 compute_type=model_compute_type)
     except Exception as e:
         ConfigManager.console_print(f'Error initializing WhisperModel: {e}')
         ConfigManager.console_print('Falling back to CPU.')
@@ -85,19 +212,39 @@ def create_local_model():
                              compute_type=compute_type,
                              download_root=None if model_path else None)
 
+    _warm_up_local_model(model)
+
     ConfigManager.console_print('Local model created.')
     return model
 
-def transcribe_local(audio_data, local_model=None):
+def _warm_up_local_model(model):
+    """
+    Run a short transcription of silence so the first real transcription doesn't pay for
+    kernel selection and weight page-in.
+    """
+    try:
+        segments, _ = model.transcribe(np.zeros(16000 // 2, dtype=np.float32),
+                                       language='en',
+                                       vad_filter=False)
+        for _ in segments:
+            pass
+    except Exception as e:
+        ConfigManager.console_print(f'Local model warm-up failed: {e}')
+
+def transcribe_local(audio_data, local_model=None, *, segment_callback: SegmentCallback | None = None):
     """
     Transcribe an audio file using a local model.
+
+    faster-whisper decodes lazily, so each segment's text is passed to segment_callback
+    (if given) as soon as it's decoded, rather than after the whole recording.
     """
     if not local_model:
         local_model = create_local_model()
     model_options = ConfigManager.get_config_section('model_options')
 
-    # Convert int16 to float32
-    audio_data_float = audio_data.astype(np.float32) / 32768.0
+    # Convert int16 to float32 in a single pass, without an intermediate buffer
+    audio_data_float = np.empty(audio_data.shape, dtype=np.float32)
+    np.multiply(audio_data, np.float32(1.0 / 32768.0), out=audio_data_float, casting='unsafe')
 
     response = local_model.transcribe(audio=audio_data_float,
                                       language=model_options['common']['language'],
@@ -105,7 +252,12 @@ def transcribe_local(audio_data, local_model=None):
                                       condition_on_previous_text=model_options['local']['condition_on_previous_text'],
                                       temperature=model_options['common']['temperature'],
                                       vad_filter=model_options['local']['vad_filter'],)
-    return ''.join([segment.text for segment in list(response[0])])
+    parts = []
+    for segment in response[0]:
+        parts.append(segment.text)
+        if segment_callback is not None:
+            segment_callback(segment.text)
+    return ''.join(parts)
 
 def _sanitize_mp3_quality(raw_quality):
     try:
@@ -114,35 +266,60 @@ def _sanitize_mp3_quality(raw_quality):
         return DEFAULT_MP3_QUALITY
     return min(max(quality, 0), 9)
 
-def _prepare_audio_payload(audio_data, sample_rate, api_options):
-    upload_format = (api_options.get('upload_format') or 'wav').lower()
-
-    if upload_format == 'mp3':
-        import lameenc
-
-        if audio_data.dtype != np.int16:
-            audio_data = audio_data.astype(np.int16, copy=False)
-
-        encoder = lameenc.Encoder()
-        encoder.set_bit_rate(DEFAULT_MP3_BITRATE_KBPS)
-        encoder.set_in_sample_rate(sample_rate)
-        encoder.set_out_sample_rate(sample_rate)
-        encoder.set_channels(1)
-        encoder.set_quality(_sanitize_mp3_quality(api_options.get('mp3_quality', DEFAULT_MP3_QUALITY)))
-
-        mp3_bytes = encoder.encode(audio_data.tobytes())
-        mp3_bytes += encoder.flush()
-        byte_io = io.BytesIO(mp3_bytes)
-        filename = 'audio.mp3'
-        mime_type = 'audio/mpeg'
-    else:
-        byte_io = io.BytesIO()
-        sf.write(byte_io, audio_data, sample_rate, format='wav')
-        filename = 'audio.wav'
-        mime_type = 'audio/wav'
-
+def _create_mp3_encoder(sample_rate, quality):
+    # lameenc finalises the encoder on flush() and rejects any further encode() calls,
+    # so encoders can't be pooled between recordings; a fresh one is needed per payload.
+    import lameenc
+
+    encoder = lameenc.Encoder()
+    encoder.set_bit_rate(DEFAULT_MP3_BITRATE_KBPS)
+    encoder.set_in_sample_rate(sample_rate)
+    encoder.set_out_sample_rate(sample_rate)
+    encoder.set_channels(1)
+    encoder.set_quality(quality)
+    return encoder
+
+def _wav_header(sample_rate, data_size):
+    # Canonical 44-byte RIFF header for 16-bit mono PCM.
+    return struct.pack('<4sI4s4sIHHIIHH4sI',
+                       b'RIFF', WAV_HEADER_SIZE_BYTES - 8 + data_size, b'WAVE',
+                       b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+                       b'data', data_size)
+
+def _encode_mp3_chunks(audio_data, sample_rate, quality) -> Iterator[bytes]:
+    """
+    Encode 16-bit mono PCM to MP3, yielding encoded frames as they become available.
+    """
+    encoder = _create_mp3_encoder(sample_rate, quality)
+
+    # lameenc only accepts read-only bytes (it rejects memoryview/ndarray buffers), so the
+    # PCM can't be passed zero-copy. Encode in fixed-size chunks instead, which bounds the
+    # temporary copy to one chunk, and hand each MP3 chunk on as soon as it's produced.
+    for start in range(0, len(audio_data), MP3_ENCODE_CHUNK_SAMPLES):
+        yield encoder.encode(audio_data[start:start + MP3_ENCODE_CHUNK_SAMPLES].tobytes())
+    yield encoder.flush()
+
+def _prepare_wav_payload(audio_data, sample_rate):
+    # The recording is already 16-bit mono PCM, so a WAV file is just the header
+    # followed by the raw samples.
+    pcm = np.ascontiguousarray(audio_data)
+    byte_io = io.BytesIO()
+    byte_io.write(_wav_header(sample_rate, pcm.nbytes))
+    byte_io.write(memoryview(pcm))
     byte_io.seek(0)
-    return filename, mime_type, byte_io
+    return byte_io
+
+def _get_api_client(api_key, base_url):
+    """
+    Return an OpenAI client for the given credentials, reusing it across calls so the
+    underlying HTTP connection pool (and its TLS sessions) is kept alive.
+    """
+    key = (api_key, base_url)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        client = OpenAI(api_key=api_key, base_url=base_url)
+        _CLIENT_CACHE[key] = client
+    return client
 
 def transcribe_api(audio_data, *, status_callback: StatusCallback | None = None):
     """
@@ -150,9 +327,9 @@ def transcribe_api(audio_data, *, status_callback: StatusCallback | None = None)
     """
     model_options = ConfigManager.get_config_section('model_options')
     api_options = model_options.get('api', {})
-    client = OpenAI(
-        api_key=os.getenv('OPENAI_API_KEY') or None,
-        base_url=model_options['api']['base_url'] or 'https://api.openai.com/v1'
+    client = _get_api_client(
+        os.getenv('OPENAI_API_KEY') or None,
+        model_options['api']['base_url'] or 'https://api.openai.com/v1',
     )
 
     # Prepare audio payload for the API (WAV or MP3 based on settings)
@@ -161,36 +338,47 @@ def transcribe_api(audio_data, *, status_callback: StatusCallback | None = None)
     _emit_status(status_callback, 'encoding')
     upload_format = (api_options.get('upload_format') or 'wav').lower()
 
+    if audio_data.dtype != np.int16:
+        audio_data = audio_data.astype(np.int16, copy=False)
+
+    # Emit 'transcribing' as soon as the HTTP client finishes reading the request body,
+    # which is the closest approximation we have to "upload complete".
+    def on_upload_complete():
+        _emit_status(status_callback, 'transcribing')
+
     if upload_format == 'mp3':
-        uncompressed_wav_io = io.BytesIO()
-        sf.write(uncompressed_wav_io, audio_data, sample_rate, format='wav')
-        uncompressed_wav_size_bytes = len(uncompressed_wav_io.getvalue())
+        # 16-bit PCM WAV: fixed-size header plus two bytes per sample, no need to encode it.
+        uncompressed_wav_size_bytes = WAV_HEADER_SIZE_BYTES + audio_data.size * 2
         ConfigManager.console_print(
             "WAV payload size (uncompressed): "
             f"{uncompressed_wav_size_bytes} bytes ({uncompressed_wav_size_bytes / 1024:.1f} KiB)"
         )
 
-    filename, mime_type, byte_io = _prepare_audio_payload(audio_data, sample_rate, api_options)
+        # Encode on a background thread and stream frames into the request body as they're
+        # produced, so the upload overlaps with encoding instead of waiting for it.
+        filename = 'audio.mp3'
+        mime_type = 'audio/mpeg'
+        quality = _sanitize_mp3_quality(api_options.get('mp3_quality', DEFAULT_MP3_QUALITY))
+        audio_buffer = _StreamingUploadIO(_encode_mp3_chunks(audio_data, sample_rate, quality),
+                                          on_upload_complete=on_upload_complete)
+    else:
+        filename = 'audio.wav'
+        mime_type = 'audio/wav'
+        byte_io = _prepare_wav_payload(audio_data, sample_rate)
 
-    audio_bytes = byte_io.getvalue()
-    encoded_size_bytes = len(audio_bytes)
-    if upload_format != 'mp3':
+        with byte_io.getbuffer() as view:
+            encoded_size_bytes = view.nbytes
         # In WAV mode, the upload payload is the WAV. Still print it explicitly so it's
         # obvious what the pre-compression size is.
         ConfigManager.console_print(
             "WAV payload size: "
             f"{encoded_size_bytes} bytes ({encoded_size_bytes / 1024:.1f} KiB)"
         )
-    ConfigManager.console_print(
-        f"Upload payload size: {encoded_size_bytes} bytes ({encoded_size_bytes / 1024:.1f} KiB)"
-    )
-
-    # Emit 'transcribing' as soon as the HTTP client finishes reading the request body,
-    # which is the closest approximation we have to "upload complete".
-    def on_upload_complete():
-        _emit_status(status_callback, 'transcribing')
+        ConfigManager.console_print(
+            f"Upload payload size: {encoded_size_bytes} bytes ({encoded_size_bytes / 1024:.1f} KiB)"
+        )
 
-    audio_buffer = _UploadNotifyingIO(audio_bytes, on_upload_complete=on_upload_complete)
+        audio_buffer = _UploadNotifyingIO(byte_io, on_upload_complete=on_upload_complete)
 
     _emit_status(status_callback, 'uploading')
 
@@ -201,24 +389,54 @@ def transcribe_api(audio_data, *, status_callback: StatusCallback | None = None)
         prompt=model_options['common']['initial_prompt'],
         temperature=model_options['common']['temperature'],
     )
+
+    if isinstance(audio_buffer, _StreamingUploadIO):
+        # The streamed payload's size is only known once encoding has finished.
+        encoded_size_bytes = audio_buffer.total_size
+        ConfigManager.console_print(
+            f"Upload payload size: {encoded_size_bytes} bytes ({encoded_size_bytes / 1024:.1f} KiB)"
+        )
     return response.text
 
+@functools.lru_cache(maxsize=1)
+def _post_processing_flags():
+    """
+    Return the (remove_trailing_period, add_trailing_space, remove_capitalization) flags.
+
+    Cached until the configuration changes, so post-processing doesn't re-read config.
+    """
+    post_processing = ConfigManager.get_config_section('post_processing')
+    return (
+        bool(post_processing['remove_trailing_period']),
+        bool(post_processing['add_trailing_space']),
+        bool(post_processing['remove_capitalization']),
+    )
+
+ConfigManager.add_change_listener(_post_processing_flags.cache_clear)
+
 def post_process_transcription(transcription):
     """
     Apply post-processing to the transcription.
     """
+    remove_trailing_period, add_trailing_space, remove_capitalization = _post_processing_flags()
+    # str.strip() returns the string itself when there's nothing to strip, so with no
+    # transforms enabled this allocates nothing for already-clean text.
     transcription = transcription.strip()
-    post_processing = ConfigManager.get_config_section('post_processing')
-    if post_processing['remove_trailing_period'] and transcription.endswith('.'):
+    if not (remove_trailing_period or add_trailing_space or remove_capitalization):
+        return transcription
+
+    if remove_trailing_period and transcription.endswith('.'):
         transcription = transcription[:-1]
-    if post_processing['add_trailing_space']:
+    if add_trailing_space:
         transcription += ' '
-    if post_processing['remove_capitalization']:
+    if remove_capitalization:
         transcription = transcription.lower()
 
     return transcription
 
-def transcribe(audio_data, local_model=None, *, status_callback: StatusCallback | None = None):
+def transcribe(audio_data, local_model=None, *,
+               status_callback: StatusCallback | None = None,
+               segment_callback: SegmentCallback | None = None):
     """
     Transcribe audio date using the OpenAI API or a local model, depending on config.
     """
@@ -229,6 +447,6 @@ def transcribe(audio_data, local_model=None, *, status_callback: StatusCallback
         transcription = transcribe_api(audio_data, status_callback=status_callback)
     else:
         _emit_status(status_callback, 'transcribing')
-        transcription = transcribe_local(audio_data, local_model)
+        transcription = transcribe_local(audio_data, local_model, segment_callback=segment_callback)
 
     return post_process_transcription(transcription)
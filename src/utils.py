@@ -3,6 +3,7 @@ import os
 
 class ConfigManager:
     _instance = None
+    _change_listeners = []
 
     def __init__(self):
         """Initialize the ConfigManager instance."""
@@ -67,6 +68,7 @@ class ConfigManager:
                 config[key] = {}
             config = config[key]
         config[keys[-1]] = value
+        cls._notify_change_listeners()
 
     @staticmethod
     def load_config_schema(schema_path=None):
@@ -128,6 +130,18 @@ class ConfigManager:
             raise RuntimeError("ConfigManager not initialized")
         cls._instance.config = cls._instance.load_default_config()
         cls._instance.load_user_config()
+        cls._notify_change_listeners()
+
+    @classmethod
+    def add_change_listener(cls, callback):
+        """Register a callback to be called whenever the configuration changes."""
+        cls._change_listeners.append(callback)
+
+    @classmethod
+    def _notify_change_listeners(cls):
+        """Call all registered configuration change callbacks."""
+        for callback in cls._change_listeners:
+            callback()
 
     @classmethod
     def config_file_exists(cls):